@@ -33,7 +33,8 @@ inventory (if any) by a blank line.
 
 import heapq
 import io
-from typing import Generic, Iterable, Iterator, TextIO, TypeVar
+import re
+from typing import Iterator, TextIO
 
 
 def test_part1() -> None:
@@ -80,6 +81,13 @@ def test_part1() -> None:
     # > The fifth Elf is carrying one food item with `10000` Calories.
     assert sum(next(elf_notes)) == 10000
 
+    # > They'd like to know how many Calories are being carried by the Elf
+    #   carrying the most Calories. In the example above, this is `24000`.
+    assert part1(io.StringIO(input)) == 24000
+
+    # A separator line with stray whitespace on it still splits the elves up
+    assert part1(io.StringIO("1\n2\n  \n3\n")) == 3
+
 
 """
 In case the Elves get hungry and need extra snacks, they need to know which Elf
@@ -101,53 +109,38 @@ Of course, arbitrarily deciding to process all input as a text stream
 complicated things.
 """
 
-# I solved the trickiness of converting the text input stream into a nested
-# iterable by making a custom type.
+# Since the elves' notes are separated by blank lines, the whole input can be
+# read in one go and split into groups on those blank lines. A "blank" line may
+# still have stray whitespace on it, so the split uses a regex rather than a
+# plain `"\n\n"`. Each group is then split on whitespace with `str.split()`,
+# which also drops the indentation around each number.
 
-T = TypeVar("T")
 
+BLANK_LINE = re.compile(r"\n\s*\n")
 
-class InspectableIter(Generic[T]):
+
+def split_elf_groups(input: TextIO) -> list[str]:
     """
-    This class provides turns `it` into an iterable with a `.has_stopped` member
-    that latches to `True` once empty.
+    Read the whole input and split it into each elf's block of notes. A line
+    holding nothing but whitespace still counts as a blank separator line.
     """
+    return BLANK_LINE.split(input.read())
 
-    def __init__(self, it: Iterable) -> None:
-        self.has_stopped = False
-        self.it = iter(it)
-
-    def __iter__(self) -> Iterator[T]:
-        return self
 
-    def __next__(self) -> T:
-        try:
-            return next(self.it)
-        except StopIteration:
-            self.has_stopped = True
-            raise
-
-
-def parse_calorie_notes(input: TextIO) -> Iterable[Iterable[int]]:
+def parse_calorie_notes(input: TextIO) -> list[list[int]]:
     """
     Parse the noted Calorie amounts from the multiline string input and return
     the total as a list of list of Calorie counts.
     """
+    return [list(map(int, group.split())) for group in split_elf_groups(input)]
 
-    def yield_group(it: Iterator) -> Iterable[int]:
-        """
-        Yields lines as ints until a blank line is found.
-
-        Equivalent to `map(int, iter(it.__next__, ""))`.
-        """
-        for val in it:
-            if val == "":
-                break
-            yield int(val)
 
-    lines: InspectableIter[str] = InspectableIter(map(str.strip, input))
-    while not lines.has_stopped:
-        yield yield_group(lines)
+def calorie_totals(input: TextIO) -> Iterator[int]:
+    """
+    Lazily yield the total Calories noted for each elf, without holding on to
+    the individual items or a list of all the totals.
+    """
+    return (sum(map(int, group.split())) for group in split_elf_groups(input))
 
 
 def part1(input: TextIO) -> int:
@@ -155,9 +148,7 @@ def part1(input: TextIO) -> int:
     Find the elf that holds the most amount of Calories, and return the amount
     of Calories they hold.
     """
-    elf_notes = parse_calorie_notes(input)
-    totals: Iterable[int] = map(sum, elf_notes)
-    return max(totals)
+    return max(calorie_totals(input))
 
 
 """
@@ -181,6 +172,15 @@ Find the top three Elves carrying the most Calories. **How many Calories are
 those Elves carrying in total?**
 """
 
+
+def test_part2() -> None:
+    """Using the same example notes as before:"""
+    input = "1000\n2000\n3000\n\n4000\n\n5000\n6000\n\n7000\n8000\n9000\n\n10000"
+
+    # > The sum of the Calories carried by these three elves is `45000`.
+    assert part2(io.StringIO(input)) == 45000
+
+
 # === Part 2 Solution: ===
 
 """
@@ -194,9 +194,8 @@ def part2(input: TextIO) -> int:
     Find the top three Elves carrying the most Calories and return their
     combined total Calorie count.
     """
-    elf_notes = parse_calorie_notes(input)
-    totals: Iterable[int] = map(sum, elf_notes)
-    return sum(heapq.nlargest(3, totals))
+    # `heapq.nlargest` only ever keeps the top three totals in its heap
+    return sum(heapq.nlargest(3, calorie_totals(input)))
 
 
 if __name__ == "__main__":
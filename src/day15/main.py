@@ -1,7 +1,7 @@
 import io
-from itertools import dropwhile, pairwise, takewhile
+from itertools import pairwise
 import re
-from typing import Iterable, Iterator, NamedTuple, TextIO
+from typing import Iterable, NamedTuple, TextIO
 
 
 class Pos(NamedTuple):
@@ -16,154 +16,197 @@ class Sensor(NamedTuple):
 
 Range = tuple[int, int]
 
+# A sensor flattened down to its x, y and cover radius, for use in hot loops
+SensorArea = tuple[int, int, int]
 
-class RangeSet:
-    """
-    This class maintains a set of ranges. Each range is a contiguous block of
-    integers, which are each specified by the first and last integer present in
-    that block. The internal
-    datastructure is kept simplified.
-
-    For example:
-    
-    >>> RangeSet([(3, 5), (7, 8)])
-    RangeSet([(3, 5), (7, 8)])
-
-    >>> RangeSet([(3, 7), (5, 8)])
-    RangeSet([(3, 8)])
-    """
-
-    def __init__(self, ranges: Iterable[Range]):
-        self.ranges: list[Range] = []
-        for r in ranges:
-            self.add(r)
 
-    def add(self, range: Range):
-        """
-        More subranges can be added with the .add() method.
-        """
-        assert range[0] <= range[1], f"Bad range :( {range}"
-        self.ranges.append(range)
-        self.ranges = list(self._simplify())
+INT = r"-?\d+"
+LINE_PATTERN = re.compile(fr"Sensor at x=({INT}), y=({INT}): closest beacon is at x=({INT}), y=({INT})")
 
-    def __eq__(self, other: "RangeSet"):
-        return self.ranges == other.ranges
+def parse_sensors(input: TextIO) -> Iterable[Sensor]:
+    # Match every line in one pass over the whole text instead of line by line
+    for sensor_x, sensor_y, beacon_x, beacon_y in LINE_PATTERN.findall(input.read()):
+        yield Sensor(Pos(int(sensor_x), int(sensor_y)), Pos(int(beacon_x), int(beacon_y)))
 
-    def __len__(self) -> int:
-        "Return the number of ints represented by this RangeSet"
-        return sum(b - a + 1 for a, b in self.ranges)
 
-    def __bool__(self) -> bool:
-        return len(self) != 0
+def manhattan_distance(pos1: Pos, pos2: Pos) -> int:
+    return abs(pos1.x - pos2.x) + abs(pos1.y - pos2.y)
 
-    def __iter__(self) -> Iterator[int]:
-        for r in self.ranges:
-            first, last = r
-            yield from range(first, last + 1)
 
-    def _simplify(self) -> Iterable[Range]:
-        self.ranges.sort()
+def sensor_areas(sensors: list[Sensor]) -> list[SensorArea]:
+    """
+    Flatten the sensors into (x, y, radius) tuples, so that the row loops
+    don't recompute the same distances and attribute lookups every row.
+    """
+    return [
+        (sensor.pos.x, sensor.pos.y, manhattan_distance(sensor.pos, sensor.nearest_beacon))
+        for sensor in sensors
+    ]
 
-        # TODO check case of [1, 5], [1, 3]
 
-        prev_range = self.ranges[0]
-        for next_range in self.ranges[1:]:
-            if prev_range[1] >= next_range[0] - 1:
-                # The end of one range is at least touching the next range, so merge
-                prev_range = prev_range[0], max(prev_range[1], next_range[1])
-            else:
-                # There is a proper gap now, so yield out this range
-                yield prev_range
-                prev_range = next_range
+def row_cover_ranges(areas: list[SensorArea], y: int) -> list[Range]:
+    "Return the sorted ranges of positions in row y that each sensor covers"
+    ranges = [
+        (sensor_x - r, sensor_x + r)
+        for sensor_x, sensor_y, radius in areas
+        if (r := radius - abs(sensor_y - y)) >= 0
+    ]
+    ranges.sort()
+    return ranges
 
-        yield prev_range
 
-    def inverse_of(self, min_max_range: Range) -> "RangeSet":
-        """
-        Return the RangeSet that results from removing all of self's ranges from
-        the min_max_range.
-        """
-        def inverse_ranges() -> Iterable[Range]:
-            "Generate the ranges that come between all the others"
-            if len(self.ranges) == 0:
-                return min_max_range
+def merge_ranges(sorted_ranges: list[Range]) -> list[Range]:
+    """
+    Merge sorted ranges that overlap or touch into one list of disjoint ranges.
 
-            first_range = self.ranges[0]
-            if first_range[0] > min_max_range[0]:
-                yield min_max_range[0], min([min_max_range[1], first_range[0]])
+    >>> merge_ranges([(3, 5), (7, 8)])
+    [(3, 5), (7, 8)]
 
-            for range, next_range in pairwise(self.ranges):
-                yield range[1] + 1, next_range[0] - 1
+    >>> merge_ranges([(3, 7), (5, 8)])
+    [(3, 8)]
+    """
+    merged: list[Range] = []
+    for first, last in sorted_ranges:
+        if merged and merged[-1][1] >= first - 1:
+            merged[-1] = merged[-1][0], max(merged[-1][1], last)
+        else:
+            merged.append((first, last))
+    return merged
 
-            last_range = self.ranges[-1]
-            if last_range[1] < min_max_range[1]:
-                yield max([last_range[1], min_max_range[0]]), min_max_range[1]
 
-        def restrict_ranges(ranges) -> Iterable[Range]:
-            def too_far_left(r: Range) -> bool:
-                return r[1] < min_max_range[0]
-            def not_too_far_right(r: Range) -> bool:
-                return r[0] <= min_max_range[1]
+def count_covered_locations(sensors: list[Sensor], row: int):
+    # For each sensor, find the range that it covered on the given row. Then
+    # merge the sorted ranges together in one sweep, and add up the widths of
+    # the merged ranges.
+    merged = merge_ranges(row_cover_ranges(sensor_areas(sensors), row))
 
-            it = iter(ranges)
-            unclipped_ranges = list(takewhile(not_too_far_right, dropwhile(too_far_left, it)))
-            if not unclipped_ranges:
-                return unclipped_ranges
+    return sum(last - first + 1 for first, last in merged)
 
-            # Clip first range
-            unclipped_ranges[0] = max(unclipped_ranges[0][0], min_max_range[0]), unclipped_ranges[0][1]
 
-            # Clip last range
-            unclipped_ranges[-1] = unclipped_ranges[-1][0], min(unclipped_ranges[-1][1], min_max_range[1]), 
+def scan_row(areas: list[SensorArea], y: int, x_range: Range) -> Iterable[Range]:
+    """
+    Yield the ranges of positions in row y, within x_range, that no sensor
+    covers. Each gap is yielded as a single range rather than one position at a
+    time, so a wide gap costs no more than a narrow one.
 
-            return unclipped_ranges
+    Sweep across the sorted cover ranges from left to right, jumping straight
+    past each covered span.
+    """
+    x, x_max = x_range
+    for first, last in row_cover_ranges(areas, y):
+        if x > x_max:
+            return
+        if first > x:
+            yield x, min(first - 1, x_max)
+        x = max(x, last + 1)
 
-        return RangeSet(restrict_ranges(inverse_ranges()))
+    if x <= x_max:
+        yield x, x_max
 
 
-INT = r"-?\d+"
-LINE_PATTERN = re.compile(fr"Sensor at x=({INT}), y=({INT}): closest beacon is at x=({INT}), y=({INT})")
+def active_areas(areas: list[SensorArea], y_range: Range) -> Iterable[tuple[Range, list[SensorArea]]]:
+    """
+    Split y_range up into runs of rows that are reached by the same sensors, and
+    yield each run along with just those sensors. Sensors only start or stop
+    reaching a row at the top or bottom tip of their diamond, so there are only
+    a handful of runs, and the row scans can skip every sensor that is too far
+    away.
+
+    >>> list(active_areas([(0, 0, 1), (5, 3, 1)], (-1, 5)))
+    [((-1, 1), [(0, 0, 1)]), ((2, 4), [(5, 3, 1)]), ((5, 5), [])]
+    """
+    first_y, last_y = y_range
+    boundaries = {first_y, last_y + 1}
+    for _, sensor_y, radius in areas:
+        for y in (sensor_y - radius, sensor_y + radius + 1):
+            if first_y < y <= last_y:
+                boundaries.add(y)
 
-def parse_sensors(input: TextIO) -> Iterable[Sensor]:
-    for line in input:
-        if m := LINE_PATTERN.match(line):
-            sensor_x, sensor_y, beacon_x, beacon_y = m.groups()
-            yield Sensor(Pos(int(sensor_x), int(sensor_y)), Pos(int(beacon_x), int(beacon_y)))
+    for start, stop in pairwise(sorted(boundaries)):
+        active = [area for area in areas if abs(area[1] - start) <= area[2]]
+        yield (start, stop - 1), active
 
 
-def manhattan_distance(pos1: Pos, pos2: Pos) -> int:
-    return abs(pos1.x - pos2.x) + abs(pos1.y - pos2.y)
-
+def find_uncovered_ranges(sensors: list[Sensor], x_range: Range, y_range: Range) -> Iterable[tuple[int, Range]]:
+    "Yield each row's uncovered ranges, along with the row's y coordinate"
+    for rows, areas in active_areas(sensor_areas(sensors), y_range):
+        for y in range(rows[0], rows[1] + 1):
+            for gap in scan_row(areas, y, x_range):
+                yield y, gap
 
-def get_cover_set(sensors: list[Sensor], row: int):
-    cover_set = RangeSet([])
-    for sensor in sensors:
-        cover_distance = manhattan_distance(sensor.pos, sensor.nearest_beacon)
-        row_cover_radius = cover_distance - abs(sensor.pos.y - row)
-        if row_cover_radius < 0:
-            continue
-        row_cover_range = (sensor.pos.x - row_cover_radius, sensor.pos.x + row_cover_radius)
-        cover_set.add(row_cover_range)
-    return cover_set
 
+def is_covered(areas: list[SensorArea], x: int, y: int) -> bool:
+    return any(abs(x - sensor_x) + abs(y - sensor_y) <= radius for sensor_x, sensor_y, radius in areas)
 
-def count_covered_locations(sensors: list[Sensor], row: int):
-    # For each sensor, find the range that it covered on the given row. Then
-    # throw all of those into a RangeSet. Then use the RangeSet to quickly count
-    # the number of positions covered by sensors.
-    rset = get_cover_set(sensors, row)
 
-    return len(rset)
+def candidate_positions(areas: list[SensorArea], x_range: Range, y_range: Range) -> Iterable[tuple[int, int]]:
+    """
+    Rotating the grid by 45 degrees (a = x + y, b = x - y) turns each sensor's
+    diamond into an axis aligned square. A lone uncovered position sits just
+    outside the edges of the diamonds around it, so it is usually found where an
+    a-line and a b-line one or two steps outside the diamonds cross. (It can be
+    hemmed in on all four sides by lines of the same direction, leaving the
+    diagonal neighbours to be covered by diamonds two steps away.) Positions
+    pinned against the edge of the search area are included too.
+
+    Candidates are plain (x, y) tuples, since only the answer needs to be a Pos.
+    """
+    offsets = [
+        (x, y, offset)
+        for x, y, radius in areas
+        for offset in (-radius - 2, -radius - 1, radius + 1, radius + 2)
+    ]
+    a_lines = {x + y + offset for x, y, offset in offsets}
+    b_lines = {x - y + offset for x, y, offset in offsets}
+
+    for a in a_lines:
+        for b in b_lines:
+            if (a + b) % 2 == 0:
+                yield (a + b) // 2, (a - b) // 2
+
+    yield from edge_candidates(a_lines, b_lines, x_range, y_range)
+
+
+def edge_candidates(
+    a_lines: set[int], b_lines: set[int], x_range: Range, y_range: Range
+) -> Iterable[tuple[int, int]]:
+    "Yield the search area's corners, and where each line crosses its edges"
+    x_edges = (x_range[0], x_range[1])
+    y_edges = (y_range[0], y_range[1])
+
+    for x in x_edges:
+        for y in y_edges:
+            yield x, y
+        for a in a_lines:
+            yield x, a - x
+        for b in b_lines:
+            yield x, x - b
+    for y in y_edges:
+        for a in a_lines:
+            yield a - y, y
+        for b in b_lines:
+            yield b + y, y
+
+
+def find_uncovered_position(sensors: list[Sensor], x_range: Range, y_range: Range) -> Pos:
+    """
+    Find the only position within the search area that no sensor covers,
+    by checking the candidate line intersections instead of every row. If none
+    of the candidates pan out, fall back to scanning the rows.
+    """
+    areas = sensor_areas(sensors)
+    for x, y in candidate_positions(areas, x_range, y_range):
+        if (
+            x_range[0] <= x <= x_range[1]
+            and y_range[0] <= y <= y_range[1]
+            and not is_covered(areas, x, y)
+        ):
+            return Pos(x, y)
 
+    for y, (x, _) in find_uncovered_ranges(sensors, x_range, y_range):
+        return Pos(x, y)
 
-def find_uncovered_positions(sensors: list[Sensor], x_range: Range, y_range: Range) -> Iterable[Pos]:
-    for y in range(y_range[0], y_range[1] + 1):
-        if y % 100000 == 0:
-            print(y)
-        cover_set = get_cover_set(sensors, y)
-        uncovered_set = cover_set.inverse_of(x_range)
-        for x in uncovered_set:
-            yield Pos(x, y)
+    raise RuntimeError("No uncovered position found")
 
 
 EXAMPLE_INPUT = """\
@@ -190,16 +233,44 @@ def test_part1():
 
     assert manhattan_distance(sensors[6].pos, sensors[6].nearest_beacon) == 9
 
-    assert RangeSet([(3, 7), (5, 8)]).ranges == [(3, 8)]
-    assert RangeSet([(1, 5), (1, 3)]).ranges == [(1, 5)]
+    assert merge_ranges([(3, 7), (5, 8)]) == [(3, 8)]
+    assert merge_ranges([(1, 3), (1, 5)]) == [(1, 5)]
 
     assert count_covered_locations([Sensor(Pos(8, 7), Pos(2, 10))], 10) == 13
 
+    # On row 0 these sensors cover 1..5, then 1..3 and 3..3 nested inside it,
+    # listed out of order
+    nested_sensors = [
+        Sensor(Pos(3, 0), Pos(5, 0)),
+        Sensor(Pos(2, 0), Pos(1, 0)),
+        Sensor(Pos(3, 1), Pos(3, 2)),
+    ]
+    assert row_cover_ranges(sensor_areas(nested_sensors), 0) == [(1, 3), (1, 5), (3, 3)]
+    assert count_covered_locations(nested_sensors, 0) == 5
+
+    # 26 positions in row 10 can't contain a beacon, plus the known beacon at 2,10
+    assert count_covered_locations(sensors, 10) == 27
+
 
 def test_part2():
     sensors = list(parse_sensors(io.StringIO(EXAMPLE_INPUT)))
-    for pos in find_uncovered_positions(sensors, (0, 20), (0, 20)):
-        print(pos)
+    assert list(find_uncovered_ranges(sensors, (0, 20), (0, 20))) == [(11, (14, 14))]
+    assert find_uncovered_position(sensors, (0, 20), (0, 20)) == Pos(14, 11)
+
+    # This gap is boxed in by b-lines only, and is two steps outside the
+    # diamond of the sensor at 22,11
+    sensors = [
+        Sensor(Pos(12, 22), Pos(9, 27)),
+        Sensor(Pos(22, 11), Pos(16, 19)),
+        Sensor(Pos(6, 16), Pos(11, 21)),
+        Sensor(Pos(12, -3), Pos(19, -9)),
+        Sensor(Pos(19, 18), Pos(23, 12)),
+        Sensor(Pos(20, -2), Pos(17, -8)),
+        Sensor(Pos(-3, 6), Pos(2, -1)),
+        Sensor(Pos(-3, 18), Pos(2, 26)),
+    ]
+    assert list(find_uncovered_ranges(sensors, (0, 20), (0, 20))) == [(8, (9, 9))]
+    assert find_uncovered_position(sensors, (0, 20), (0, 20)) == Pos(9, 8)
 
 
 def part1(input: TextIO) -> int:
@@ -216,24 +287,19 @@ def part1(input: TextIO) -> int:
 
 def part2(input: TextIO) -> int:
     """
-    From the given sensor input text, output the number of positions on row
-    y=2000000 where a hidden beacon could possibly be found.
+    From the given sensor input text, find the only position within
+    0 <= x, y <= 4000000 that no sensor covers and output its tuning frequency.
     """
-    frequency = 0
     sensors = list(parse_sensors(input))
-    for pos in find_uncovered_positions(sensors, (0, 4000000), (0, 4000000)):
-        frequency = pos.x * 4000000 + pos.y
-        print(f"Maybe beacon at {pos} with frequency {frequency}")
-    return frequency
+    pos = find_uncovered_position(sensors, (0, 4000000), (0, 4000000))
+    return pos.x * 4000000 + pos.y
 
 
 if __name__ == "__main__":
     # Print out part 1 solution
-    # test_part1()
-    # test_part2()
-
     with open("input.txt") as puzzle_input:
         print("Part 1:", part1(puzzle_input))
 
+    # Print out part 2 solution
     with open("input.txt") as puzzle_input:
         print("Part 2:", part2(puzzle_input))
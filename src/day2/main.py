@@ -9,6 +9,7 @@ in progress.
 """
 
 from enum import Enum
+import io
 from typing import NamedTuple, TextIO
 
 # Rock Paper Scissors is a game between two players. Each game contains many
@@ -31,11 +32,8 @@ class Round(NamedTuple):
 # selected: Rock defeats Scissors, Scissors defeats Paper, and Paper defeats
 # Rock. If both players choose the same shape, the round instead ends in a draw.
 
-winning_combos = {
-    (Move.rock, Move.scissors),
-    (Move.scissors, Move.paper),
-    (Move.paper, Move.rock),
-}
+# In other words, each move beats the move numbered one below it, wrapping
+# around from Rock back to Scissors.
 
 # Appreciative of your help yesterday, one Elf gives you an **encrypted strategy
 # guide** (your puzzle input) that they say will be sure to help you win. "The
@@ -101,6 +99,11 @@ def test_part1() -> None:
     #   you a score of 3 + 3 = 6.
     assert score_round(decode_round("C Z")) == 6
 
+    # > In this example, if you were to follow the strategy guide, you would get
+    #   a total score of `15` (8 + 1 + 6).
+    assert part1(io.StringIO("A Y\nB X\nC Z\n")) == 15
+    assert part1(io.StringIO("A  Y\nB X\nC Z\n")) == 15
+
 
 """
 In this example, if you were to follow the strategy guide, you would get a total
@@ -135,6 +138,12 @@ def decode_round(
     )
 
 
+# Since each move beats the one below it, the difference between the two moves
+# mod 3 gives the result directly: 0 is a draw, 1 a win and 2 a loss.
+
+result_by_move_difference = [RoundResult.draw, RoundResult.win, RoundResult.loss]
+
+
 def decide_round(round: Round) -> RoundResult:
     """
     Return the result of the given RPS round.
@@ -142,13 +151,7 @@ def decide_round(round: Round) -> RoundResult:
         >>> decide_round(Round(their_move=Move.rock, my_move=Move.paper))
         <RoundResult.win: 6>
     """
-    if (round.my_move, round.their_move) in winning_combos:
-        return RoundResult.win
-
-    if (round.their_move, round.my_move) in winning_combos:
-        return RoundResult.loss
-
-    return RoundResult.draw
+    return result_by_move_difference[(round.my_move.value - round.their_move.value) % 3]
 
 
 def score_round(round: Round) -> int:
@@ -156,12 +159,22 @@ def score_round(round: Round) -> int:
     return round.my_move.value + decide_round(round).value
 
 
+# There are only nine possible lines in a strategy guide, so score each of them
+# once up front and just look the lines up while totaling.
+
+PART1_SCORE: dict[str, int] = {
+    f"{their} {mine}": score_round(decode_round(f"{their} {mine}"))
+    for their in their_move_decode
+    for mine in my_move_decode
+}
+
+
 def part1(input: TextIO) -> int:
     """
     Calculate the total score that would result if the given strategy guide
     was accurate.
     """
-    return sum(score_round(decode_round(line.strip())) for line in input)
+    return sum(PART1_SCORE[" ".join(line.split())] for line in input)
 
 
 """
@@ -201,6 +214,10 @@ def test_part2() -> None:
     #   for a score of 1 + 6 = **7**.
     assert score_round(decode_round_with_result("C Z")) == 7
 
+    # > Now that you're correctly decrypting the ultra top secret strategy
+    #   guide, you would get a total score of **12**.
+    assert part2(io.StringIO("A Y\nB X\nC Z\n")) == 12
+
 
 """
 Now that you're correctly decrypting the ultra top secret strategy guide, you
@@ -244,12 +261,21 @@ def decode_round_with_result(
     raise RuntimeError("No moves lead to the intended result")
 
 
+# Same trick as part 1: precompute the score of each of the nine possible lines.
+
+PART2_SCORE: dict[str, int] = {
+    f"{their} {result}": score_round(decode_round_with_result(f"{their} {result}"))
+    for their in their_move_decode
+    for result in intended_result_decode
+}
+
+
 def part2(input: TextIO) -> int:
     """
     Calculate the total score that would result if the strategy guide was
     followed using the new interpretation.
     """
-    return sum(score_round(decode_round_with_result(line.strip())) for line in input)
+    return sum(PART2_SCORE[" ".join(line.split())] for line in input)
 
 
 if __name__ == "__main__":